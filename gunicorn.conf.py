@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for HCM AI Sample App.
+
+The server talks to Pinecone over gRPC. gRPC's C core blocks the calling
+thread instead of yielding to the gevent hub, so the gevent worker must
+route it through gevent before the first channel is opened.
+"""
+
+
+def post_worker_init(worker):
+    """
+    Make gRPC cooperative in gevent workers.
+
+    Runs after the worker has monkey-patched the standard library and
+    reinitialized the hub, as grpc requires, and before any request is
+    served. Pinecone channels are opened lazily, so none exists yet.
+
+    Args:
+        worker: The worker process that finished initializing
+    """
+    if worker.__class__.__module__.startswith("gunicorn.workers.ggevent"):
+        from grpc.experimental import gevent as grpc_gevent
+
+        grpc_gevent.init_gevent()
@@ -7,18 +7,45 @@ for a multi-LLM provider chat application with unified API interface.
 
 import logging
 
+import orjson
 from .api import HealthCheckApi, ChatApi
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_restful import Api
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes responses with orjson.
+
+    Used by jsonify; dicts returned from flask-restful resources are still
+    serialized by flask-restful itself. Types orjson cannot encode natively
+    (e.g. Decimal) are converted by Flask's default hook. Output differs
+    from the standard provider: keys are not sorted, datetimes are written
+    as ISO-8601 instead of HTTP dates, and dict keys must be strings.
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize an object to a JSON string using orjson.
+
+        Args:
+            obj: The data to serialize
+            **kwargs: Ignored; accepted for compatibility with the base provider
+
+        Returns:
+            str: JSON representation of obj
+        """
+        return orjson.dumps(obj, default=self.default).decode()
+
+
 def create_app():
     """
     Create and configure the Flask application.
     
-    Sets up the Flask app with CORS support, REST API endpoints,
-    and logging configuration for the HCM AI Sample App.
+    Sets up the Flask app with CORS support, orjson response serialization,
+    REST API endpoints, and logging configuration for the HCM AI Sample App.
     
     Returns:
         Flask: Configured Flask application instance with:
@@ -27,6 +54,7 @@ def create_app():
                - Logging configured for application monitoring
     """
     app = Flask("DMancipate")
+    app.json = OrjsonProvider(app)
     app.config["CORS_HEADER"] = "Content-Type"
     CORS(app)
 
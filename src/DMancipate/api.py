@@ -6,11 +6,23 @@ chat functionality with LLM providers, supporting both streaming
 and non-streaming responses.
 """
 
-import os
+import sys
+from .llm import config as conf
 from .llm.llm_client import llm
-from flask import request, jsonify, Response, stream_with_context
+from .llm.retrieval import get_index
+from flask import request, jsonify, Response
 from flask_restful import Resource
-from pinecone import Pinecone
+
+
+# Accepted string values for boolean request parameters
+_BOOL_TRUE = frozenset({"True", "true"})
+_BOOL_VALID = frozenset({"True", "False", "true", "false"})
+
+# Headers that stop browsers and reverse proxies from buffering event streams
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
 
 
 class HealthCheckApi(Resource):
@@ -41,8 +53,10 @@ class ChatApi(Resource):
     Handles chat requests with support for both streaming and non-streaming
     responses across different LLM providers (OpenAI, LangChain, Llama Stack).
     """
-    def __init__(self):
-        self.allowed_actions = ["talk", "attack", "skill_check", "use_item", "look", "pick_up", "ask", "review", "use_skill"]
+    ALLOWED_ACTIONS = frozenset(
+        sys.intern(a)
+        for a in ["talk", "attack", "skill_check", "use_item", "look", "pick_up", "ask", "review", "use_skill"]
+    )
 
     def post(self):
         """
@@ -55,14 +69,14 @@ class ChatApi(Resource):
         Request JSON format:
             {
                 "prompt": "User message to send to the LLM",
-                "enable_stream": "True" or "False" (string, case-insensitive),
+                "enable_stream": true or false (boolean, or the strings "True"/"False"/"true"/"false"),
                 "action": "talk", "attack", "skill_check", "use_item", "look", "pick_up" (string, case-insensitive)
             }
         
         Returns:
             For streaming (enable_stream=True):
-                Response: Server-Sent Events stream with JSON chunks
-                         Each chunk: {"content": "text_fragment"}
+                Response: Server-Sent Events stream (text/event-stream)
+                         Each event: data: {"content": "text_fragment"}
             
             For non-streaming (enable_stream=False):
                 JSON: {"result": "complete_response_text"}
@@ -77,9 +91,13 @@ class ChatApi(Resource):
 
         try:
             response = llm.client.chat(prompt, enable_stream, action)
-
             if enable_stream:
-                return Response(stream_with_context(llm.client.streaming_response(response)), mimetype="application/json")
+                # streaming_response never reads the request context, so skip stream_with_context
+                return Response(
+                    llm.client.streaming_response(response),
+                    mimetype="text/event-stream",
+                    headers=_SSE_HEADERS,
+                )
             else:
                 content = llm.client.await_response(response)
                 return jsonify({"result": content})
@@ -91,23 +109,20 @@ class ChatApi(Resource):
         Reset campaign history by deleting all documents from the campaign-history index.
         
         This endpoint removes all game history stored in the Pinecone "campaign-history" 
-        index, effectively resetting the campaign to a fresh state.
+        index for the configured CAMPAIGN_SESSION_ID namespace, effectively resetting
+        the campaign to a fresh state.
         
         Returns:
             JSON: {"message": "Campaign history reset successfully"} on success
             JSON: {"error": "error_description"} with appropriate HTTP status on error
         """
         try:
-            # Initialize Pinecone client
-            api_key = os.getenv("PINECONE_API_KEY")
-            if not api_key:
-                return {"error": "Pinecone API key not configured"}, 500
-            
-            pc = Pinecone(api_key=api_key)
-            index = pc.Index("campaign-history")
-            
-            # Delete all documents from the campaign-history index
-            index.delete(delete_all=True)
+            # Queued write-backs, cached responses and the local mirror hold the history being
+            # deleted; discard them first so no queued turn is upserted after the delete
+            if llm.client_type == "langchain":
+                llm.client.reset_campaign_caches()
+            # Delete all documents from this campaign's namespace of the campaign-history index
+            get_index("campaign-history").delete(delete_all=True, namespace=conf.CAMPAIGN_SESSION_ID)
             
             return {"message": "Campaign history reset successfully"}, 200
             
@@ -129,18 +144,19 @@ class ChatApi(Resource):
                        or required parameters are not provided
         """
 
-        data = request.get_json()
+        # Parse the body once; malformed or non-JSON bodies yield None
+        data = request.get_json(cache=True, silent=True)
 
-        if not data:
+        if not data or not isinstance(data, dict):
             raise ValueError ("Missing JSON body")
 
         prompt = data.get("prompt")
-        enable_stream = data.get("enable_stream", "False")
+        enable_stream = data.get("enable_stream", False)
         action = data.get("action")
 
-        if action not in self.allowed_actions:
+        if action not in ChatApi.ALLOWED_ACTIONS:
             raise ValueError (f"Invalid action: {action}")
-        if enable_stream not in ("True", "False", "true", "false"):
+        if not isinstance(enable_stream, bool) and enable_stream not in _BOOL_VALID:
             raise ValueError (f"Invalid boolean value for 'enable_stream': {enable_stream}")
         if prompt is None:
             raise ValueError ("Missing 'prompt' parameter")
@@ -149,15 +165,17 @@ class ChatApi(Resource):
 
     def _parse_bool(self, value):
         """
-        Parse string boolean values to actual boolean.
+        Parse boolean request values to actual boolean.
         
-        Converts string representations of boolean values to actual boolean types.
-        Accepts both "True"/"False" and "true"/"false" formats.
+        JSON booleans are returned as is. String representations are
+        converted, accepting both "True"/"False" and "true"/"false" formats.
         
         Args:
-            value (str): String representation of boolean ("True", "False", "true", "false")
+            value (bool or str): Boolean, or its string representation ("True", "False", "true", "false")
             
         Returns:
-            bool: True if value is "True" or "true", False otherwise
+            bool: True if value is true, "True" or "true", False otherwise
         """
-        return value == "True" or value == "true"
\ No newline at end of file
+        if isinstance(value, bool):
+            return value
+        return value in _BOOL_TRUE
\ No newline at end of file
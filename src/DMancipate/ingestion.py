@@ -1,14 +1,26 @@
 import os
-import glob
+import asyncio
+import uuid
+import httpx
 from dotenv import load_dotenv
 from langchain_ollama import OllamaEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from langchain_text_splitters import CharacterTextSplitter
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader
-from pinecone import Pinecone
+from pinecone.grpc import PineconeGRPC as Pinecone
+# Run as a script, so the llm package is imported directly; importing DMancipate would build the app
+from llm.embeddings import quantize_int8
 
 load_dotenv()
 
+# Directory holding the PDF files to ingest
+ASSETS_DIR = "src/DMancipate/assets"
+
+# Number of chunks sent per embedding request and per Pinecone upsert
+BATCH_SIZE = 100
+
+# Maximum number of batches being embedded or upserted at the same time
+semaphore = asyncio.Semaphore(8)
+
 # Initialize Pinecone client
 pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 
@@ -17,22 +29,89 @@ file_index_mapping = {
     "HoardDragonQueen_Encounters.pdf": {"index": "campaign-modules", "namespace": None}
 }
 
-# Get all PDF files in the assets directory
-pdf_files = glob.glob("src/DMancipate/assets/*.pdf")
-print(f"Found {len(pdf_files)} PDF files to process")
 
-# Initialize embeddings
-embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
+async def upload_batch(index, batch, namespace=None):
+    """
+    Embed and upsert one batch of document chunks.
+
+    Args:
+        index: Pinecone index handle to upsert into
+        batch (list): LangChain documents to embed and upload together
+        namespace (str): Optional Pinecone namespace for the vectors
+    """
+    async with semaphore:
+        chunks_text = [t.page_content for t in batch]
+        vectors = []
+        for t, embedding in zip(batch, await embeddings.aembed_documents(chunks_text)):
+            values, scale = quantize_int8(embedding)
+            # Keep the chunk text under "text" so PineconeVectorStore can read it back
+            metadata = {**t.metadata, "text": t.page_content, "scale": scale}
+            vectors.append({"id": str(uuid.uuid4()), "values": values, "metadata": metadata})
+        await asyncio.wrap_future(index.upsert(vectors=vectors, namespace=namespace, async_req=True))
+
+
+async def upload_chunks(index, texts, namespace=None):
+    """
+    Embed and upsert document chunks into a Pinecone index in batches.
+
+    Each batch is embedded with a single request to Ollama and upserted
+    asynchronously, so the number of round trips scales with the number of
+    batches rather than the number of chunks. Batches run concurrently,
+    bounded by the shared semaphore. Embeddings are quantized to int8 and
+    the scale is stored in the metadata so it can be restored.
+
+    Args:
+        index: Pinecone index handle to upsert into
+        texts (list): LangChain documents produced by the text splitter
+        namespace (str): Optional Pinecone namespace for the vectors
+    """
+    await asyncio.gather(*(
+        upload_batch(index, texts[start:start + BATCH_SIZE], namespace)
+        for start in range(0, len(texts), BATCH_SIZE)
+    ))
+
+
+# Get all PDF files in the assets directory as (path, filename) pairs
+with os.scandir(ASSETS_DIR) as it:
+    pdf_entries = [(e.path, e.name) for e in it if e.name.endswith(".pdf")]
+print(f"Found {len(pdf_entries)} PDF files to process")
+
+# Initialize embeddings; the underlying httpx client keeps a pool of keep-alive
+# connections sized for the concurrent requests below, and Ollama keeps the model
+# loaded for 10 minutes between requests
+embeddings = OllamaEmbeddings(
+    model="nomic-embed-text",
+    base_url="http://localhost:11434",
+    keep_alive=600,
+    client_kwargs={
+        "timeout": 60,
+        "limits": httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    },
+)
+
+# Token-based splitter shared by every file; keeps chunks uniform in size
+text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=512, chunk_overlap=64)
+
+# Resolve index handles up front so every task shares them
+indexes = {
+    config["index"]: pc.Index(config["index"]) for config in file_index_mapping.values()
+}
+
+
+async def process_pdf(pdf_file, filename):
+    """
+    Load, split, embed and upload a single PDF file.
 
-# Process each PDF file
-for pdf_file in pdf_files:
-    filename = os.path.basename(pdf_file)
+    Args:
+        pdf_file (str): Path to the PDF file to ingest
+        filename (str): Base name of the PDF file
+    """
     print(f"Processing {filename}...")
     
     # Get index configuration for this file
     if filename not in file_index_mapping:
         print(f"Warning: No index mapping found for {filename}, skipping...")
-        continue
+        return
     
     config = file_index_mapping[filename]
     index_name = config["index"]
@@ -40,7 +119,7 @@ for pdf_file in pdf_files:
     
     # Clear existing documents from this index/namespace
     print(f"Clearing existing documents from index '{index_name}'{f', namespace \'{namespace}\'' if namespace else ''}...")
-    index = pc.Index(index_name)
+    index = indexes[index_name]
     # if namespace:
     #     index.delete(delete_all=True, namespace=namespace)
     # else:
@@ -48,33 +127,28 @@ for pdf_file in pdf_files:
     
     # Load and process the PDF
     loader = PyPDFLoader(pdf_file)
-    document = loader.load()
+    document = await loader.aload()
     
     # Add filename as metadata to each document
     for doc in document:
         doc.metadata["source_file"] = filename
     
     # Split into chunks
-    text_splitter = CharacterTextSplitter(chunk_size=600, chunk_overlap=150)
     texts = text_splitter.split_documents(document)
     print(f"Created {len(texts)} chunks from {filename}")
     
     # Store in the appropriate Pinecone index
     print(f"Uploading to index '{index_name}'{f', namespace \'{namespace}\'' if namespace else ''}...")
-    if namespace:
-        PineconeVectorStore.from_documents(
-            texts,
-            embeddings,
-            index_name=index_name,
-            namespace=namespace,
-        )
-    else:
-        PineconeVectorStore.from_documents(
-            texts,
-            embeddings,
-            index_name=index_name,
-        )
+    await upload_chunks(index, texts, namespace)
     
     print(f"Successfully processed {filename} into {index_name}")
 
+
+async def main():
+    """Process every PDF file concurrently; embedding and upserts are network bound."""
+    await asyncio.gather(*(process_pdf(pdf_file, filename) for pdf_file, filename in pdf_entries))
+
+
+asyncio.run(main())
+
 print("All files processed successfully!")
\ No newline at end of file
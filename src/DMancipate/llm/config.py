@@ -39,6 +39,13 @@ INFERENCE_TEMPERATURE = float(os.getenv("INFERENCE_TEMPERATURE", "0.7"))
 # Maximum number of tokens to generate in response
 INFERENCE_MAX_TOKENS = int(os.getenv("INFERENCE_MAX_TOKENS", "2048"))
 
+# Seconds to wait on an inference or embedding HTTP request
+INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "600"))
+
+# Prompt cache key sent with OpenAI-compatible requests so the server can reuse the
+# cached system prompt prefix (optional; omitted for servers that reject it)
+INFERENCE_PROMPT_CACHE_KEY = os.getenv("INFERENCE_PROMPT_CACHE_KEY")
+
 # =============================================================================
 # LangChain Provider Configuration
 # =============================================================================
@@ -46,6 +53,38 @@ INFERENCE_MAX_TOKENS = int(os.getenv("INFERENCE_MAX_TOKENS", "2048"))
 # LangChain provider type: "openai" or "ollama"
 LANGCHAIN_PROVIDER = os.getenv("LANGCHAIN_PROVIDER", "openai")
 
+# =============================================================================
+# Retrieval Configuration
+# =============================================================================
+
+# Maximum number of query embeddings kept in the in-memory LRU cache
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
+# SQLite file that keeps embeddings across restarts (disabled when unset)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+
+# Maximum number of chat responses kept in the response cache
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+
+# Seconds a cached chat response stays valid
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+
+# Minimum cosine similarity for a prompt to reuse the cached answer to an earlier one
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+# Maximum number of tokens of retrieved context included in each prompt (0 disables the limit)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+
+# Campaign history write-backs are upserted together once either limit is reached
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "16"))
+HISTORY_FLUSH_SECONDS = float(os.getenv("HISTORY_FLUSH_SECONDS", "5"))
+
+# Seconds to wait before retrying a failed load of the local campaign history mirror
+HISTORY_MIRROR_RETRY_SECONDS = float(os.getenv("HISTORY_MIRROR_RETRY_SECONDS", "300"))
+
+# Pinecone namespace holding this campaign's history (default namespace when unset)
+CAMPAIGN_SESSION_ID = os.getenv("CAMPAIGN_SESSION_ID")
+
 # =============================================================================
 # Legacy OpenAI Configuration (Backward Compatibility)
 # =============================================================================
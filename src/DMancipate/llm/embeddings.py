@@ -0,0 +1,217 @@
+"""
+Embedding helpers for HCM AI Sample App.
+
+This module provides a LangChain embeddings wrapper that memoizes query
+embeddings, so the same player prompt is only sent to the embedding model
+once no matter how many retrievers use it, an optional SQLite store that
+keeps embeddings across restarts, and int8 scalar quantization for vectors
+stored in Pinecone.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import numpy as np
+from cachetools import LRUCache
+from langchain_core.embeddings import Embeddings
+from . import config as conf
+
+logger = logging.getLogger("DMancipate")
+
+
+def quantize_int8(vector):
+    """
+    Scalar-quantize an embedding vector to the int8 range.
+
+    Args:
+        vector (list): Float embedding returned by the embedding model
+
+    Returns:
+        tuple: (values: list of ints in [-127, 127], scale: float) where
+               values * scale approximates the original vector
+    """
+    v = np.asarray(vector, dtype=np.float32)
+    scale = float(np.abs(v).max()) / 127 or 1.0
+    q = np.round(v / scale).astype(np.int8)
+    return q.tolist(), scale
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache in a SQLite table.
+
+    Rows are keyed by the SHA-256 of the model name and text, so switching
+    embedding models never returns vectors from the old one. Vectors are
+    stored as float32 bytes.
+    """
+
+    def __init__(self, path, model):
+        """
+        Open the store, creating the table if needed.
+
+        Args:
+            path (str): Path of the SQLite database file
+            model (str): Name of the embedding model the vectors come from
+        """
+        self._model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL lets several server workers read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+
+    def _hash(self, text):
+        return hashlib.sha256(f"{self._model}\0{text}".encode()).digest()
+
+    def get_many(self, texts):
+        """
+        Look up stored embeddings.
+
+        Args:
+            texts (list): Texts to look up
+
+        Returns:
+            dict: Embedding vector for each text that was found, keyed by text
+        """
+        hashes = {self._hash(text): text for text in texts}
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", list(hashes)
+            ).fetchall()
+        return {hashes[key]: np.frombuffer(vec, dtype=np.float32).tolist() for key, vec in rows}
+
+    def put_many(self, vectors):
+        """
+        Store embeddings.
+
+        Args:
+            vectors (dict): Embedding vector for each text, keyed by text
+        """
+        rows = [
+            (self._hash(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in vectors.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    LangChain embeddings wrapper with an LRU cache for query embeddings.
+
+    Queries are normalized (whitespace collapsed, lower-cased) before the
+    lookup so trivially different prompts share an entry. Document
+    embeddings used for writes bypass the in-memory cache. When an
+    EmbeddingStore is given, both are also read from and written to it,
+    so they survive restarts.
+
+    Attributes:
+        hits: Number of query embeddings served from the cache
+        misses: Number of query embeddings computed by the wrapped model
+    """
+
+    def __init__(self, embeddings, maxsize=conf.EMBEDDING_CACHE_SIZE, store=None):
+        """
+        Initialize the cached embeddings wrapper.
+
+        Args:
+            embeddings: LangChain embeddings used to compute cache misses
+            maxsize (int): Maximum number of query embeddings to keep
+            store (EmbeddingStore): Optional persistent store checked after the in-memory cache
+        """
+        self._embeddings = embeddings
+        self._store = store
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(text):
+        return " ".join(text.split()).lower()
+
+    def _embed_missing(self, texts):
+        found = self._store.get_many(texts) if self._store else {}
+        missing = [text for text in texts if text not in found]
+        if missing:
+            computed = dict(zip(missing, self._embeddings.embed_documents(missing)))
+            if self._store:
+                self._store.put_many(computed)
+            found.update(computed)
+        return found
+
+    def embed_queries(self, texts):
+        """
+        Embed several queries, computing all cache misses in one batch.
+
+        Args:
+            texts (list): Query strings to embed
+
+        Returns:
+            list: One embedding vector per query, in input order
+        """
+        keys = [self._normalize(text) for text in texts]
+        with self._lock:
+            found = {key: self._cache.get(key) for key in keys}
+        missing = [key for key, vector in found.items() if vector is None]
+
+        if missing:
+            found.update(self._embed_missing(missing))
+            with self._lock:
+                self._cache.update((key, found[key]) for key in missing)
+
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text):
+        """
+        Embed a single query, using the cache when possible.
+
+        Args:
+            text (str): Query string to embed
+
+        Returns:
+            list: Embedding vector for the query
+        """
+        return self.embed_queries([text])[0]
+
+    def embed_documents(self, texts):
+        """
+        Embed documents, bypassing the in-memory cache.
+
+        Args:
+            texts (list): Document texts to embed
+
+        Returns:
+            list: One embedding vector per document
+        """
+        if not self._store:
+            return self._embeddings.embed_documents(texts)
+        found = self._embed_missing(list(dict.fromkeys(texts)))
+        return [found[text] for text in texts]
+
+    def stats(self):
+        """
+        Report and log the cache hit rate.
+
+        Returns:
+            dict: Hits, misses, hit rate and current number of cached entries
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._cache),
+            }
+        logger.info(
+            "Embedding cache: %d hits, %d misses (%.1f%% hit rate), %d entries",
+            stats["hits"], stats["misses"], stats["hit_rate"] * 100, stats["size"],
+        )
+        return stats
@@ -0,0 +1,31 @@
+"""
+HTTP connection settings for HCM AI Sample App.
+
+This module provides the pooled HTTP client shared by the OpenAI-compatible
+clients and the connection settings passed to the Ollama clients, so every
+provider keeps warm keep-alive connections sized for concurrent retrieval.
+"""
+
+from functools import lru_cache
+import httpx
+from . import config as conf
+
+# Connection pool shared by each HTTP client
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Fail fast on connect, but leave room for long generations
+HTTP_TIMEOUT = httpx.Timeout(conf.INFERENCE_TIMEOUT, connect=5.0)
+
+# Keyword arguments for the httpx client inside the ollama package
+OLLAMA_CLIENT_KWARGS = {"limits": HTTP_LIMITS, "timeout": HTTP_TIMEOUT}
+
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """
+    Get the shared pooled HTTP client.
+
+    Returns:
+        httpx.Client: Client created on first use and reused afterwards
+    """
+    return httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
@@ -6,13 +6,187 @@ This module provides a unified interface for multiple LLM providers through Lang
 supporting OpenAI and Ollama providers with configurable parameters.
 """
 
-import json
-from langchain_core.messages import HumanMessage, SystemMessage
+import atexit
+import logging
+import queue
+import textwrap
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain.chains import RetrievalQA, ConversationalRetrievalChain
 from langchain_ollama import OllamaEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from . import config as conf
+from .embeddings import CachedEmbeddings, EmbeddingStore, quantize_int8
+from .http import OLLAMA_CLIENT_KWARGS, get_http_client
+from .response_cache import ResponseCache
+from .retrieval import LocalVectorIndex, dedupe_texts, fit_token_budget, get_index, query_texts
+from .sse import content_event, error_event
+
+logger = logging.getLogger("DMancipate")
+
+# Streamed tokens are buffered until either limit is reached, then flushed together
+STREAM_BUFFER_CHARS = 64
+STREAM_BUFFER_SECONDS = 0.02
+
+# Actions whose responses are never reused: dice rolls in the prompt, or a summary of
+# the whole campaign history, which changes every turn
+UNCACHED_ACTIONS = frozenset({"attack", "skill_check", "use_skill", "review"})
+
+# Worker threads shared by every request for the concurrent context lookups
+_retrieval_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
+
+# Queue sentinel that tells the campaign history writer to flush and exit
+_STOP = object()
+
+# Instructions added to the prompt for each player action
+ASK_PROMPT = "The player is asking you the DM a question. The context you are given is for your eyes only. You should not reveal this information to the player directly. If you see something like 1d4 or 1d6, that means you need to determine what the number is. Don't tell the player. If the action requires a skill check tell the player to do that check before allowing the action to continue."
+TALK_PROMPT = "The player is talking to an NPC. Determine the NPC's personality and provide a concise answer but only reveal information if the player asks for it directly. If the user is required to pass a deception or persuasion check, tell the player to do that check before allowing the action to continue."
+ATTACK_PROMPT = "The player is attacking a monster. Provide a concise answer but only reveal information that is relevant to the player's attack. Before allowing the attack to happen, make sure the player specifies their attack roll and make sure it is greater than or equal to the monsters AC. If the attack is successful, provide a concise answer on what happens as a result of the attack."
+SKILL_CHECK_PROMPT = "The player is performing a skill check. Provide a concise, one or two sentence answer on what the player should do to achieve the goal of the skill check. Include the revelant modifiers the player needs to add to the roll for the skill check. This should be as simple as 'Roll a Stealth check and add your wisdom modifier'"
+USE_SKILL_PROMPT = "The player is using a skill. Provide a concise response to what happens as a result of the skill being used. A key part of determining the outcome is the roll number associated with the skill. Check for a difficulty number and compare it to the roll number. If the roll number is higher than or equal to the difficulty number, the skill was successful. If the roll number is lower than the difficulty number, the skill was not successful."
+USE_ITEM_PROMPT = "The player is using an item. Provide a concise answer but only reveal information that is relevant to the player's item use. If the item requires a skill check, tell the player to do that check before allowing the action to continue."
+LOOK_PROMPT = "The player is looking around. Provide a concise description on what the player is looking at. It should only be a few sentences."
+PICK_UP_PROMPT = "The player is picking up an item. Provide a concise one sentence response the player picking up the item."
+REVIEW_PROMPT = "The player is reviewing the campaign history. Provide a concise summary of the campaign history."
+
+# Prompt sent to the LLM for every turn, without the source indentation. The
+# static instructions come first so turns with the same action share a prefix
+# that the provider's prompt cache can reuse.
+USER_QUERY_TEMPLATE = textwrap.dedent("""\
+    {instructions}
+    {action_prompt}
+    Only provide information that is mentioned in the following context. If it's not in that context then the player would not know about it:
+    {quest_context}
+
+    The following are relevant information to the player's action or question.
+    {contexts}
+    Here is what the player wants to do:
+    {prompt}
+    """)
+
+# Player action -> (action prompt, vector index holding the action-specific context)
+ACTION_CONFIG = {
+    "ask": (ASK_PROMPT, "campaign-modules"),
+    "talk": (TALK_PROMPT, "campaign-modules"),
+    "attack": (ATTACK_PROMPT, "monster-vector"),
+    "skill_check": (SKILL_CHECK_PROMPT, "dnd-vector"),
+    "use_skill": (USE_SKILL_PROMPT, "campaign-modules"),
+    "use_item": (USE_ITEM_PROMPT, "dnd-vector"),
+    "look": (LOOK_PROMPT, "campaign-modules"),
+    "pick_up": (PICK_UP_PROMPT, "campaign-modules"),
+    "review": (REVIEW_PROMPT, None),
+}
+
+
+@lru_cache(maxsize=8)
+def _build_llm(provider, api_key, model_name, base_url, temperature, max_tokens):
+    """
+    Build a LangChain chat model, memoized on its configuration.
+
+    Constructing a model imports the provider package and runs pydantic
+    validation, so identical configurations share a single instance.
+
+    Args:
+        provider (str): LangChain provider, "openai" or "ollama"
+        api_key (str): API key for the provider, if required
+        model_name (str): Name of the model to use
+        base_url (str): Optional custom endpoint for the provider
+        temperature (float): Sampling temperature
+        max_tokens (int): Maximum number of tokens to generate
+
+    Returns:
+        LangChain model instance: Configured ChatOpenAI or ChatOllama instance
+
+    Raises:
+        ValueError: If provider is unsupported or configuration is invalid
+    """
+    try:
+        if provider == "openai":
+            from langchain_openai import ChatOpenAI
+            if not api_key:
+                raise ValueError("API key is required. Set INFERENCE_API_KEY or OPENAI_API_KEY environment variable.")
+            
+            llm_kwargs = {
+                "model": model_name,
+                "api_key": api_key,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "http_client": get_http_client(),
+            }
+            
+            if base_url:
+                llm_kwargs["base_url"] = base_url
+
+            if conf.INFERENCE_PROMPT_CACHE_KEY:
+                llm_kwargs["extra_body"] = {"prompt_cache_key": conf.INFERENCE_PROMPT_CACHE_KEY}
+            
+            return ChatOpenAI(**llm_kwargs)
+            
+        elif provider == "ollama":
+            from langchain_ollama import ChatOllama
+            return ChatOllama(
+                model=model_name or "llama3.2",
+                base_url=base_url or "http://localhost:11434",
+                temperature=temperature,
+                client_kwargs=OLLAMA_CLIENT_KWARGS,
+            )
+            
+        else:
+            raise ValueError(f"Unsupported provider: {provider}. Supported providers: openai, ollama")
+            
+    except ImportError as e:
+        raise ValueError(f"Required LangChain package not installed for provider '{provider}': {e}")
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings():
+    """
+    Get the process-wide query embeddings.
+
+    Returns:
+        CachedEmbeddings: Ollama embeddings wrapped in the query cache, backed
+                          by the SQLite store when EMBEDDING_CACHE_PATH is set
+    """
+    model = "nomic-embed-text"
+    store = EmbeddingStore(conf.EMBEDDING_CACHE_PATH, model) if conf.EMBEDDING_CACHE_PATH else None
+    return CachedEmbeddings(
+        OllamaEmbeddings(model=model, base_url="http://localhost:11434", client_kwargs=OLLAMA_CLIENT_KWARGS),
+        store=store,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_vectorstore(index_name, namespace=None):
+    """
+    Get the process-wide vector store for a Pinecone index and namespace.
+
+    The stores wrap the shared gRPC index handles, so every client instance
+    reuses the same channels instead of reconnecting.
+
+    Args:
+        index_name (str): Name of the Pinecone index
+        namespace (str): Optional Pinecone namespace to search
+
+    Returns:
+        PineconeVectorStore: Store created on first use and reused afterwards
+    """
+    return PineconeVectorStore(index=get_index(index_name), namespace=namespace, embedding=_get_embeddings())
+
+
+@lru_cache(maxsize=1)
+def _get_local_history():
+    """
+    Get the process-wide in-memory mirror of the campaign-history index.
+
+    Returns:
+        LocalVectorIndex: Mirror loaded lazily on the first retrieval
+    """
+    return LocalVectorIndex()
 
 
 class LangChainClient:
@@ -36,6 +210,35 @@ class LangChainClient:
         self.llm = self._initialize_llm()
         self.instructions = conf.SUMMARY_PROMPT
         self.history = []
+        # Campaign history write-backs are queued and upserted in batches off the request path.
+        # Entries are stamped with the reset generation they were queued in, and the lock keeps
+        # a reset from interleaving with an upsert
+        self._pending_history = queue.Queue()
+        self._history_generation = 0
+        self._history_lock = threading.Lock()
+        self._writer = threading.Thread(
+            target=self._drain_campaign_history, name="campaign-history", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self._flush_campaign_history)
+
+        # Embedding client and campaign history mirror are shared by every client instance
+        self._embeddings = _get_embeddings()
+        self._local_history = _get_local_history()
+        # Monotonic time before which a failed mirror load is not retried; the lock also
+        # keeps concurrent lookups from repeating a failing load
+        self._mirror_retry_at = 0.0
+        self._mirror_lock = threading.Lock()
+        # Whether the campaign-history namespace is empty; None until checked
+        self._campaign_empty = None
+        # Complete responses, matched exactly or by prompt similarity
+        self._response_cache = ResponseCache(self._embeddings)
+        # Action-specific retrieval helpers, keyed by the index names used in ACTION_CONFIG
+        self._retrievers = {
+            "dnd-vector": self._get_rules_context,
+            "monster-vector": self._get_monster_context,
+            "campaign-modules": self._get_campaign_modules_context,
+        }
 
     def _initialize_llm(self):
         """
@@ -52,119 +255,188 @@ class LangChainClient:
             ImportError: If required LangChain package is not installed
         """
         # Use LangChain specific provider configuration
-        provider = conf.LANGCHAIN_PROVIDER.lower()
-        api_key = conf.INFERENCE_API_KEY or conf.OPENAI_API_KEY
-        model_name = conf.INFERENCE_MODEL_NAME or conf.OPENAI_MODEL_NAME
-        base_url = conf.INFERENCE_BASE_URL or conf.OPENAI_BASE_URL
-        
+        return _build_llm(
+            conf.LANGCHAIN_PROVIDER.lower(),
+            conf.INFERENCE_API_KEY or conf.OPENAI_API_KEY,
+            conf.INFERENCE_MODEL_NAME or conf.OPENAI_MODEL_NAME,
+            conf.INFERENCE_BASE_URL or conf.OPENAI_BASE_URL,
+            conf.INFERENCE_TEMPERATURE,
+            conf.INFERENCE_MAX_TOKENS,
+        )
+
+    def _get_rules_context(self, query_vector):
+        docs = query_texts(query_vector, get_index("dnd-vector"), top_k=2)
+        logger.debug("rules context: %s", docs)
+        return docs
+
+    def _get_monster_context(self, query_vector):
+        docs = query_texts(query_vector, get_index("monster-vector"), top_k=1)
+        logger.debug("monster context: %s", docs)
+        return docs
+
+    def _get_campaign_context(self, query_vector):
+        if not self._local_history.loaded:
+            with self._mirror_lock:
+                if not self._local_history.loaded and time.monotonic() >= self._mirror_retry_at:
+                    try:
+                        self._local_history.load(get_index("campaign-history"), conf.CAMPAIGN_SESSION_ID)
+                    except Exception as e:
+                        # Use the Pinecone fallback until the retry interval has passed
+                        self._mirror_retry_at = time.monotonic() + conf.HISTORY_MIRROR_RETRY_SECONDS
+                        logger.warning(
+                            "Error loading campaign history mirror, retrying in %.0fs: %s",
+                            conf.HISTORY_MIRROR_RETRY_SECONDS, e,
+                        )
+
+        # Consecutive turns are often near-identical, so pick diverse entries by MMR
+        if self._local_history.loaded:
+            history_docs = self._local_history.mmr_query(query_vector, top_k=2, fetch_k=20, lambda_mult=0.5)
+        elif self._is_campaign_empty():
+            # A new campaign has no history yet, so skip the query until the first write-back
+            history_docs = []
+        else:
+            store = _get_vectorstore("campaign-history", conf.CAMPAIGN_SESSION_ID)
+            docs = store.max_marginal_relevance_search_by_vector(query_vector, k=2, fetch_k=20, lambda_mult=0.5)
+            history_docs = [doc.page_content for doc in docs]
+        logger.debug("campaign history: %s", history_docs)
+        return history_docs
+
+    def _is_campaign_empty(self):
+        """
+        Check whether the campaign-history namespace holds any entries.
+
+        The vector count is read once from the index stats and then kept up
+        to date by the write-back and reset paths.
+
+        Returns:
+            bool: True if the campaign has no history yet
+        """
+        if self._campaign_empty is None:
+            try:
+                stats = get_index("campaign-history").describe_index_stats()
+                # Current Pinecone reports the default namespace as "__default__", older releases as ""
+                keys = [conf.CAMPAIGN_SESSION_ID] if conf.CAMPAIGN_SESSION_ID else ["__default__", ""]
+                namespace = next((stats.namespaces[key] for key in keys if key in stats.namespaces), None)
+                self._campaign_empty = not namespace or namespace.vector_count == 0
+            except Exception as e:
+                logger.warning("Error reading campaign history stats: %s", e)
+                return False
+        return self._campaign_empty
+
+    def _get_campaign_modules_context(self, query_vector):
+        module_docs = query_texts(query_vector, get_index("campaign-modules"), top_k=2, namespace="HoardDragonQueen")
+        logger.debug("campaign modules: %s", module_docs)
+        return module_docs
+
+
+    def _update_campaign_vector_store(self, responses):
+        logger.debug("updating campaign history: %s", responses)
         try:
-            if provider == "openai":
-                from langchain_openai import ChatOpenAI
-                if not api_key:
-                    raise ValueError("API key is required. Set INFERENCE_API_KEY or OPENAI_API_KEY environment variable.")
-                
-                llm_kwargs = {
-                    "model": model_name,
-                    "api_key": api_key,
-                    "temperature": conf.INFERENCE_TEMPERATURE,
-                    "max_tokens": conf.INFERENCE_MAX_TOKENS
-                }
-                
-                if base_url:
-                    llm_kwargs["base_url"] = base_url
-                
-                return ChatOpenAI(**llm_kwargs)
-                
-            elif provider == "ollama":
-                from langchain_ollama import ChatOllama
-                return ChatOllama(
-                    model=model_name or "llama3.2",
-                    base_url=base_url or "http://localhost:11434",
-                    temperature=conf.INFERENCE_TEMPERATURE
-                )
-                
+            vectors = []
+            for text, embedding in zip(responses, self._embeddings.embed_documents(responses)):
+                values, scale = quantize_int8(embedding)
+                vectors.append({"id": str(uuid.uuid4()), "values": values, "metadata": {"text": text, "scale": scale}})
+            get_index("campaign-history").upsert(vectors=vectors, namespace=conf.CAMPAIGN_SESSION_ID)
+            self._local_history.add([v["id"] for v in vectors], [v["values"] for v in vectors], responses)
+            self._campaign_empty = False
+        except Exception as e:
+            logger.error("Error updating campaign history: %s", e)
+
+    def _drain_campaign_history(self):
+        """
+        Upsert queued campaign history entries in batches.
+
+        Runs on the writer thread. A batch is written once it holds
+        conf.HISTORY_BATCH_SIZE entries or conf.HISTORY_FLUSH_SECONDS after
+        its first entry arrived, whichever comes first. Returns after writing the
+        pending batch when the stop sentinel is received. Entries queued
+        before the last campaign reset are dropped.
+        """
+        while True:
+            item = self._pending_history.get()
+            batch = []
+            deadline = time.monotonic() + conf.HISTORY_FLUSH_SECONDS
+            while item is not _STOP:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= conf.HISTORY_BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    item = self._pending_history.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                with self._history_lock:
+                    responses = [text for generation, text in batch if generation == self._history_generation]
+                    if responses:
+                        self._update_campaign_vector_store(responses)
+            if item is _STOP:
+                return
+
+    def _flush_campaign_history(self, timeout=10):
+        """
+        Write any queued campaign history entries and stop the writer thread.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait for the final upsert
+        """
+        self._pending_history.put(_STOP)
+        self._writer.join(timeout)
+
+    def _get_contexts(self, action, prompt, history_future=None):
+        """
+        Retrieve the contexts needed to answer a player action.
+
+        The prompt is embedded once and the vector is shared by every lookup.
+        The campaign history does not depend on the action, so its retrieval
+        is submitted to the shared retrieval pool before the action is
+        dispatched (or earlier by the caller), and the action-specific
+        retrieval runs on the calling thread while it is in flight. The combined
+        context is capped at CONTEXT_TOKEN_BUDGET tokens.
+
+        Args:
+            action (str): The player action being performed
+            prompt (str): The player's message
+            history_future (Future): Campaign history retrieval already in
+                                     flight for this prompt, if any
+
+        Returns:
+            tuple: (quest_context: str, contexts: str, action_prompt: str) where
+                   quest_context is the campaign history and contexts is the
+                   action-specific context
+        """
+        query_vector = self._embeddings.embed_query(prompt)
+        if action == "review":
+            # Reviews only summarize the campaign history, so nothing else is dispatched
+            if history_future is None:
+                history_docs = self._get_campaign_context(query_vector)
             else:
-                raise ValueError(f"Unsupported provider: {provider}. Supported providers: openai, ollama")
-                
-        except ImportError as e:
-            raise ValueError(f"Required LangChain package not installed for provider '{provider}': {e}")
-
-    def _get_rules_context(self, user_query):
-        embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
-        vectorstore = PineconeVectorStore(index_name="dnd-vector", embedding=embeddings)
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 2})
-        docs = retriever.invoke(user_query)
-        print(f"rules context: {docs}")
-        return "\n".join([doc.page_content for doc in docs])
-
-    def _get_monster_context(self, user_query):
-        embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
-        vectorstore = PineconeVectorStore(index_name="monster-vector", embedding=embeddings)
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 1})
-        docs = retriever.invoke(user_query)
-        print(f"monster context: {docs}")
-        return "\n".join([doc.page_content for doc in docs])
-
-    def _get_campaign_context(self, user_query):
-        embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
-        history_vectorstore = PineconeVectorStore(index_name="campaign-history", embedding=embeddings)
-        retriever = history_vectorstore.as_retriever(search_kwargs={"k": 2})
-        history_docs = retriever.invoke(user_query)
-        print(f"campaign history: {history_docs}")
-        return "\n".join([doc.page_content for doc in history_docs])
-    def _get_campaign_modules_context(self, user_query):
-        embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
-        module_vectorstore = PineconeVectorStore(index_name="campaign-modules", namespace="HoardDragonQueen", embedding=embeddings)
-        module_retriever = module_vectorstore.as_retriever(search_kwargs={"k": 2})
-        module_docs = module_retriever.invoke(user_query)
-        print(f"campaign modules: {module_docs}")
-        return "\n".join([doc.page_content for doc in module_docs])
-
-
-    def _update_campaign_vector_store(self, response):
-        embeddings = OllamaEmbeddings(model="nomic-embed-text", base_url="http://localhost:11434")
-        vectorstore = PineconeVectorStore(index_name="campaign-history", embedding=embeddings)
-        print(f"updating campaign history: {response}")
-        vectorstore.add_texts([response])
-
-    def _get_contexts(self, action, prompt):
-        contexts = [self._get_campaign_context(prompt)]
-        action_prompt = ""
-        if action == "ask":
-            action_prompt = "The player is asking you the DM a question. The context you are given is for your eyes only. You should not reveal this information to the player directly. If you see something like 1d4 or 1d6, that means you need to determine what the number is. Don't tell the player. If the action requires a skill check tell the player to do that check before allowing the action to continue."
-            contexts.append(self._get_campaign_modules_context(prompt))
-        if action == "talk":
-            action_prompt = "The player is talking to an NPC. Determine the NPC's personality and provide a concise answer but only reveal information if the player asks for it directly. If the user is required to pass a deception or persuasion check, tell the player to do that check before allowing the action to continue."
-            contexts.append(self._get_campaign_modules_context(prompt))
-        elif action == "attack":
-            action_prompt = "The player is attacking a monster. Provide a concise answer but only reveal information that is relevant to the player's attack. Before allowing the attack to happen, make sure the player specifies their attack roll and make sure it is greater than or equal to the monsters AC. If the attack is successful, provide a concise answer on what happens as a result of the attack."
-            contexts.append(self._get_monster_context(prompt))
-        elif action == "skill_check":
-            action_prompt = "The player is performing a skill check. Provide a concise, one or two sentence answer on what the player should do to achieve the goal of the skill check. Include the revelant modifiers the player needs to add to the roll for the skill check. This should be as simple as 'Roll a Stealth check and add your wisdom modifier'"
-            contexts.append(self._get_rules_context(prompt))
-        elif action == "use_skill":
-            action_prompt = "The player is using a skill. Provide a concise response to what happens as a result of the skill being used. A key part of determining the outcome is the roll number associated with the skill. Check for a difficulty number and compare it to the roll number. If the roll number is higher than or equal to the difficulty number, the skill was successful. If the roll number is lower than the difficulty number, the skill was not successful."
-            contexts.append(self._get_campaign_modules_context(prompt))
-        elif action == "use_item":
-            action_prompt = "The player is using an item. Provide a concise answer but only reveal information that is relevant to the player's item use. If the item requires a skill check, tell the player to do that check before allowing the action to continue."
-            contexts.append(self._get_rules_context(prompt))
-        elif action == "look":
-            action_prompt = "The player is looking around. Provide a concise description on what the player is looking at. It should only be a few sentences."
-            contexts.append(self._get_campaign_modules_context(prompt))
-        elif action == "pick_up":
-            action_prompt = "The player is picking up an item. Provide a concise one sentence response the player picking up the item."
-            contexts.append(self._get_campaign_modules_context(prompt))
-        elif action == "review":
-            action_prompt = "The player is reviewing the campaign history. Provide a concise summary of the campaign history."
-        return "\n".join(contexts), action_prompt
+                history_docs = history_future.result()
+            history_docs = fit_token_budget(dedupe_texts(history_docs), conf.CONTEXT_TOKEN_BUDGET)
+            return "\n".join(history_docs), "", REVIEW_PROMPT
+
+        if history_future is None:
+            history_future = _retrieval_pool.submit(self._get_campaign_context, query_vector)
+        action_prompt, retriever_name = ACTION_CONFIG.get(action, ("", None))
+        action_docs = []
+        if retriever_name:
+            action_docs = self._retrievers[retriever_name](query_vector)
+        history_docs = history_future.result()
 
+        # Drop repeated passages, e.g. lore surfaced by both the history and the modules,
+        # then cap the total context, trimming action context before campaign history
+        history_docs = dedupe_texts(history_docs)
+        docs = fit_token_budget(dedupe_texts(history_docs + action_docs), conf.CONTEXT_TOKEN_BUDGET)
+        return "\n".join(docs[:len(history_docs)]), "\n".join(docs[len(history_docs):]), action_prompt
 
     def chat(self, prompt, enable_stream=False, action=None):
         """
         Send a chat message to the LLM using LangChain.
         
         Processes the user prompt with the configured system instructions
-        and sends it to the LLM provider via LangChain.
+        and sends it to the LLM provider via LangChain. Repeated or closely
+        similar prompts for actions outside UNCACHED_ACTIONS are answered from
+        the response cache without retrieval or generation.
         
         Args:
             prompt (str): The user's message to send to the LLM
@@ -180,74 +452,161 @@ class LangChainClient:
             Exception: If LLM request fails or configuration is invalid
         """
 
-        contexts, action_prompt = self._get_contexts(action, prompt)
-        quest_context = self._get_campaign_context(prompt)
-        user_query = f"""
-        {self.instructions}
-        Here is what the player wants to do:
-        {prompt}
-        Only provide information that is mentioned in the following context. If it's not in that context then the player would not know about it:
-        {quest_context}
-
-        {action_prompt}
-        The following are relevant information to the player's action or question.
-        {contexts}
-        """
-        print(user_query)
+        cacheable = action not in UNCACHED_ACTIONS
+        # Captured before retrieval so an answer built from history reset meanwhile is not cached
+        generation = self._response_cache.generation
+        cached = self._response_cache.get_exact(action, prompt) if cacheable else None
+        if cached is None:
+            # Every action needs the campaign history, so start retrieving it
+            # speculatively while the semantic tier is checked
+            query_vector = self._embeddings.embed_query(prompt)
+            history_future = _retrieval_pool.submit(self._get_campaign_context, query_vector)
+            if cacheable:
+                cached = self._response_cache.get_similar(action, query_vector)
+                if cached is not None:
+                    # Skips the history lookup unless the pool has already started it
+                    history_future.cancel()
+        if cached is not None:
+            if enable_stream:
+                return iter([AIMessageChunk(content=cached)])
+            return AIMessage(content=cached)
+
+        quest_context, contexts, action_prompt = self._get_contexts(action, prompt, history_future)
+        user_query = USER_QUERY_TEMPLATE.format(
+            instructions=self.instructions,
+            prompt=prompt,
+            quest_context=quest_context,
+            action_prompt=action_prompt,
+            contexts=contexts,
+        )
+        logger.debug("user query: %s", user_query)
         try:
             if enable_stream:
-                response = self.llm.stream(user_query)
-            else:
-                response = self.llm.invoke(user_query)
+                return self._record_stream(self.llm.stream(user_query), prompt, action, cacheable, generation)
 
+            response = self.llm.invoke(user_query)
             self.history.append((prompt, response.content))
+            if cacheable:
+                self._response_cache.put(action, prompt, response.content, generation)
             if action != "review":
-                self._update_campaign_vector_store(response.content)
+                self._pending_history.put((self._history_generation, response.content))
             return response
         except Exception as e:
-            print(f"Error creating LangChain chat completion: {e}")
+            logger.error("Error creating LangChain chat completion: %s", e)
             raise
 
+    def reset_campaign_caches(self):
+        """
+        Discard queued write-backs, cached responses and the local campaign history mirror.
+
+        Must be called before the campaign history namespace is deleted.
+        Returns once any upsert already in progress has finished, and turns
+        still queued are dropped by the writer, so none of them can be
+        written back after the delete.
+        """
+        with self._history_lock:
+            self._history_generation += 1
+            self._local_history.clear()
+            self._campaign_empty = True
+            self._response_cache.invalidate()
+
+    def _record_stream(self, response, prompt, action, cacheable=False, generation=0):
+        """
+        Pass streamed chunks through while recording the full response.
+
+        Once the last chunk has been yielded the response is added to the
+        history and queued for the campaign history writer, so the client is
+        not kept waiting for the upsert.
+
+        Args:
+            response: LangChain streaming generator that yields message chunks
+            prompt (str): The player's message
+            action (str): The player action being performed
+            cacheable (bool): Whether the response may be stored in the
+                              response cache
+            generation (int): Response cache generation the context was
+                              retrieved in
+
+        Yields:
+            LangChain message chunks, unchanged
+        """
+        parts = []
+        for chunk in response:
+            parts.append(chunk.content)
+            yield chunk
+
+        text = "".join(parts)
+        self.history.append((prompt, text))
+        if cacheable:
+            self._response_cache.put(action, prompt, text, generation)
+        if action != "review":
+            self._pending_history.put((self._history_generation, text))
+
     def streaming_response(self, response):
         """
-        Process streaming response from LangChain into JSON format.
+        Process streaming response from LangChain into Server-Sent Events.
         
-        Converts LangChain streaming chunks into standardized JSON format
-        for consistent API responses across all client types.
+        Converts LangChain streaming chunks into standardized JSON events
+        for consistent API responses across all client types. Tokens are
+        buffered and emitted together once STREAM_BUFFER_CHARS characters
+        have accumulated or STREAM_BUFFER_SECONDS have passed since the
+        last write, which keeps the number of network writes low.
         
         Args:
             response: LangChain streaming generator that yields message chunks
             
         Yields:
-            str: JSON-formatted strings containing response content.
-                 Each yield contains: {"content": "chunk_text"}
-                 On error: {"content": "", "error": "error_message"}
+            bytes: Server-Sent Events whose data is a JSON object.
+                   Each yield contains: data: {"content": "chunk_text"}
+                   On error: data: {"content": "", "error": "error_message"}
         """
+        buf = []
+        buf_len = 0
+        t0 = time.monotonic()
         try:
             for chunk in response:
-                if hasattr(chunk, 'content') and chunk.content:
-                    event_data = {"content": chunk.content}
-                    yield f"{json.dumps(event_data)}\n"
-                elif isinstance(chunk, dict):
-                    text = (
-                        chunk.get("answer")
-                        or chunk.get("content")
-                        or chunk.get("result")
-                        or chunk.get("output_text")
-                        or ""
-                    )
-                    if text:
-                        event_data = {"content": text}
-                        yield f"{json.dumps(event_data)}\n"
-                elif isinstance(chunk, str) and chunk:
-                    event_data = {"content": chunk}
-                    yield f"{json.dumps(event_data)}\n"
+                # LangChain message chunks always carry .content; other shapes are rare
+                try:
+                    text = chunk.content
+                except AttributeError:
+                    text = self._chunk_text(chunk)
+                if not text:
+                    continue
+                buf.append(text)
+                buf_len += len(text)
+                if buf_len >= STREAM_BUFFER_CHARS or time.monotonic() - t0 > STREAM_BUFFER_SECONDS:
+                    yield content_event("".join(buf))
+                    buf.clear()
+                    buf_len = 0
+                    t0 = time.monotonic()
+            if buf:
+                yield content_event("".join(buf))
         except Exception as e:
-            fallback_data = {
-                "content": "",
-                "error": f"streaming error: {str(e)}"
-            }
-            yield f"{json.dumps(fallback_data)}\n"
+            if buf:
+                yield content_event("".join(buf))
+            yield error_event(e)
+
+    def _chunk_text(self, chunk):
+        """
+        Extract the text carried by a non-message streaming chunk.
+
+        Args:
+            chunk: Dict or string yielded by a LangChain stream
+
+        Returns:
+            str: The chunk text, or an empty string if it carries none
+        """
+        if isinstance(chunk, dict):
+            return (
+                chunk.get("answer")
+                or chunk.get("content")
+                or chunk.get("result")
+                or chunk.get("output_text")
+                or ""
+            )
+        if isinstance(chunk, str):
+            return chunk
+        return ""
 
     def await_response(self, response):
         """
@@ -15,7 +15,8 @@ class LlmClient:
     
     This class implements a factory pattern to create and manage different
     LLM client instances based on the LLM_CLIENT_TYPE configuration.
-    It ensures only one client instance is created per application lifecycle.
+    It is a singleton: every LlmClient() call returns the same instance, so
+    only one client instance is created per application lifecycle.
     
     Attributes:
         client: The initialized LLM client instance (OpenAI, LangChain, or Llama Stack)
@@ -24,15 +25,28 @@ class LlmClient:
 
     client = None
     client_type = None
+    _instance = None
+
+    def __new__(cls):
+        """
+        Return the shared LlmClient instance, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     def __init__(self):
         """
         Initialize the LLM client factory.
         
         Creates the appropriate client instance based on LLM_CLIENT_TYPE
-        configuration and stores it for reuse.
+        configuration and stores it for reuse. Later calls on the shared
+        instance are no-ops.
         """
-        self.client, self.client_type = self._initialize_client()
+        if getattr(self, "_initialized", False):
+            return
+        LlmClient.client, LlmClient.client_type = self._initialize_client()
+        self._initialized = True
 
     def _initialize_client(self):
         """
@@ -48,18 +62,19 @@ class LlmClient:
             Exception: If client type is unsupported
             ValueError: If client initialization fails
         """
-        if self.client == None or self.client_type == None:
-            try:
-                client_type = conf.LLM_CLIENT_TYPE
-                if client_type == "openai":
-                    client = self._create_openai_client()
-                elif client_type == "langchain":
-                    client = self._create_langchain_client()
-                else:
-                    raise Exception(f"{client_type} client type is not supported. Available client types: openai, langchain")
-                return client, client_type
-            except Exception as e:
-                raise ValueError(f"Error initializing LLM client: {str(e)}")
+        if LlmClient.client is not None and LlmClient.client_type is not None:
+            return LlmClient.client, LlmClient.client_type
+        try:
+            client_type = conf.LLM_CLIENT_TYPE
+            if client_type == "openai":
+                client = self._create_openai_client()
+            elif client_type == "langchain":
+                client = self._create_langchain_client()
+            else:
+                raise Exception(f"{client_type} client type is not supported. Available client types: openai, langchain")
+            return client, client_type
+        except Exception as e:
+            raise ValueError(f"Error initializing LLM client: {str(e)}")
 
     def _create_openai_client(self):
         """
@@ -5,10 +5,13 @@ This module provides a direct interface to OpenAI's API with support for
 chat completions and streaming responses using configurable parameters.
 """
 
-import json
-
+import logging
 from openai import OpenAI
 from . import config as conf
+from .http import get_http_client
+from .sse import content_event, error_event
+
+logger = logging.getLogger("DMancipate")
 
 
 class OpenAIClient:
@@ -42,10 +45,17 @@ class OpenAIClient:
         
         self.client = OpenAI(
             api_key=api_key,
-            base_url=base_url if base_url else None
+            base_url=base_url if base_url else None,
+            http_client=get_http_client(),
         )
         self.model = conf.INFERENCE_MODEL_NAME or conf.OPENAI_MODEL_NAME
         self.instructions = conf.SUMMARY_PROMPT
+        # The system message never changes, so it is built once and always sent
+        # first, keeping the prompt prefix stable for server-side prompt caching
+        self._system_message = {"role": "system", "content": self.instructions}
+        self._extra_body = (
+            {"prompt_cache_key": conf.INFERENCE_PROMPT_CACHE_KEY} if conf.INFERENCE_PROMPT_CACHE_KEY else None
+        )
 
     def chat(self, prompt, enable_stream=False):
         """
@@ -68,7 +78,7 @@ class OpenAIClient:
             Exception: If OpenAI API request fails or configuration is invalid
         """
         messages = [
-            {"role": "system", "content": self.instructions},
+            self._system_message,
             {"role": "user", "content": prompt}
         ]
         
@@ -78,40 +88,36 @@ class OpenAIClient:
                 messages=messages,
                 stream=enable_stream,
                 temperature=conf.INFERENCE_TEMPERATURE,
-                max_tokens=conf.INFERENCE_MAX_TOKENS
+                max_tokens=conf.INFERENCE_MAX_TOKENS,
+                extra_body=self._extra_body,
             )
             return response
         except Exception as e:
-            print(f"Error creating OpenAI chat completion: {e}")
+            logger.error("Error creating OpenAI chat completion: %s", e)
             raise
 
     def streaming_response(self, response):
         """
-        Process streaming response from OpenAI into JSON format.
+        Process streaming response from OpenAI into Server-Sent Events.
         
-        Converts OpenAI streaming chunks into standardized JSON format
+        Converts OpenAI streaming chunks into standardized JSON events
         for consistent API responses across all client types.
         
         Args:
             response: OpenAI streaming generator that yields completion chunks
             
         Yields:
-            str: JSON-formatted strings containing response content.
-                 Each yield contains: {"content": "chunk_text"}
-                 On error: {"content": "", "error": "error_message"}
+            bytes: Server-Sent Events whose data is a JSON object.
+                   Each yield contains: data: {"content": "chunk_text"}
+                   On error: data: {"content": "", "error": "error_message"}
         """
         try:
             for chunk in response:
-                if chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    event_data = {"content": content}
-                    yield f"{json.dumps(event_data)}\n"
+                content = chunk.choices[0].delta.content
+                if content is not None:
+                    yield content_event(content)
         except Exception as e:
-            fallback_data = {
-                "content": "",
-                "error": f"streaming error: {str(e)}"
-            }
-            yield f"{json.dumps(fallback_data)}\n"
+            yield error_event(e)
 
     def await_response(self, response):
         """
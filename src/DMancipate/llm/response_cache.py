@@ -0,0 +1,166 @@
+"""
+Chat response cache for HCM AI Sample App.
+
+This module provides a two-tier cache of complete chat responses: an
+exact-match tier keyed on the normalized prompt and a semantic tier that
+reuses the answer to an earlier prompt whose embedding is close enough.
+Entries are not invalidated as new turns are recorded, so an answer may lag
+the campaign history by up to the TTL; the cache is emptied when the
+campaign is reset.
+"""
+
+import logging
+import threading
+import numpy as np
+from cachetools import TTLCache
+from . import config as conf
+
+logger = logging.getLogger("DMancipate")
+
+
+class ResponseCache:
+    """
+    Two-tier TTL cache of complete chat responses, scoped per action.
+
+    The exact tier is checked first. On a miss, the prompt embedding is
+    compared with the embeddings of earlier prompts for the same action and
+    the answer of the closest one is returned if its cosine similarity
+    reaches the threshold.
+
+    invalidate() empties both tiers and starts a new generation when the
+    campaign is reset; responses generated against an older generation are
+    not stored.
+
+    Attributes:
+        generation: Counter bumped each time the campaign is reset
+        hits: Number of lookups answered by the exact tier
+        semantic_hits: Number of lookups answered by the semantic tier
+        misses: Number of lookups answered by neither tier
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        maxsize=conf.RESPONSE_CACHE_SIZE,
+        ttl=conf.RESPONSE_CACHE_TTL,
+        threshold=conf.SEMANTIC_CACHE_THRESHOLD,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            embeddings: Embeddings used to vectorize prompts for the semantic tier
+            maxsize (int): Maximum number of responses kept in each tier
+            ttl (int): Seconds a cached response stays valid
+            threshold (float): Minimum cosine similarity for a semantic hit
+        """
+        self._embeddings = embeddings
+        self._threshold = threshold
+        self._exact = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._semantic = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(action, prompt):
+        return action, " ".join(prompt.split()).lower()
+
+    def _embed(self, prompt):
+        return self._normalize(self._embeddings.embed_query(prompt))
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _record(self, action, tier):
+        with self._lock:
+            if tier is None:
+                self.misses += 1
+            elif tier == "exact":
+                self.hits += 1
+            else:
+                self.semantic_hits += 1
+            hits, semantic_hits, misses = self.hits, self.semantic_hits, self.misses
+        logger.info(
+            "Response cache %s for action %r (%d exact hits, %d semantic hits, %d misses)",
+            "miss" if tier is None else f"{tier} hit", action, hits, semantic_hits, misses,
+        )
+
+    def get_exact(self, action, prompt):
+        """
+        Look up the response to a prompt in the exact tier.
+
+        Needs no embedding, so it is checked before anything else. A miss
+        is not counted until the semantic tier has been checked as well.
+
+        Args:
+            action (str): The player action being performed
+            prompt (str): The player's message
+
+        Returns:
+            str: The cached response text, or None on a miss
+        """
+        with self._lock:
+            cached = self._exact.get(self._key(action, prompt))
+        if cached is not None:
+            self._record(action, "exact")
+        return cached
+
+    def get_similar(self, action, vector):
+        """
+        Look up the response to the most similar earlier prompt in the semantic tier.
+
+        Args:
+            action (str): The player action being performed
+            vector (list): Embedding of the player's message
+
+        Returns:
+            str: The cached response text, or None on a miss
+        """
+        with self._lock:
+            entries = [
+                (cached_vector, text) for entry_action, cached_vector, text in self._semantic.values()
+                if entry_action == action
+            ]
+
+        cached = None
+        if entries:
+            scores = np.stack([cached_vector for cached_vector, _ in entries]) @ self._normalize(vector)
+            best = int(np.argmax(scores))
+            if scores[best] >= self._threshold:
+                cached = entries[best][1]
+        self._record(action, None if cached is None else "semantic")
+        return cached
+
+    def put(self, action, prompt, text, generation):
+        """
+        Store the response to a prompt in both tiers.
+
+        Args:
+            action (str): The player action being performed
+            prompt (str): The player's message
+            text (str): The complete response text
+            generation (int): Value of generation when the response's context
+                              was retrieved; stale responses are dropped
+        """
+        if generation != self.generation:
+            return
+        key = self._key(action, prompt)
+        vector = self._embed(prompt)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._exact[key] = text
+            self._semantic[key] = (action, vector, text)
+
+    def invalidate(self):
+        """Drop every cached response and start a new generation, e.g. after the campaign was reset."""
+        with self._lock:
+            self.generation += 1
+            self._exact.clear()
+            self._semantic.clear()
@@ -0,0 +1,277 @@
+"""
+Pinecone retrieval helpers for HCM AI Sample App.
+
+This module provides shared Pinecone gRPC index handles, a query helper
+that returns matching document texts for a precomputed vector, helpers
+that trim retrieved context before it is sent to the LLM, and an
+in-process mirror for small indexes that are read on every turn.
+"""
+
+import logging
+import os
+import threading
+from functools import lru_cache
+import numpy as np
+from pinecone.grpc import PineconeGRPC as Pinecone
+
+logger = logging.getLogger("DMancipate")
+
+# Rough characters per token, used when the tokenizer is unavailable
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Get the shared Pinecone client.
+
+    Returns:
+        Pinecone: Client created on first use and reused afterwards
+
+    Raises:
+        ValueError: If the Pinecone API key is not configured
+    """
+    api_key = os.getenv("PINECONE_API_KEY")
+    if not api_key:
+        raise ValueError("Pinecone API key not configured")
+
+    return Pinecone(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def get_index(index_name):
+    """
+    Get a shared handle for a Pinecone index.
+
+    Args:
+        index_name (str): Name of the Pinecone index
+
+    Returns:
+        Index: Index handle created on first use and reused afterwards
+    """
+    return get_client().Index(index_name)
+
+
+def query_texts(vector, index, top_k=5, namespace=None):
+    """
+    Retrieve the top matching documents for one precomputed vector.
+
+    Queries the gRPC index directly rather than through a LangChain vector
+    store, so no Document objects or callback managers are created.
+
+    Args:
+        vector (list): Query embedding vector
+        index: Pinecone index handle to query
+        top_k (int): Number of matches to return
+        namespace (str): Optional Pinecone namespace to query
+
+    Returns:
+        list: Document texts, best match first
+    """
+    response = index.query(vector=vector, top_k=top_k, namespace=namespace, include_metadata=True)
+    return [match.metadata["text"] for match in response.matches]
+
+
+def dedupe_texts(texts, threshold=0.9):
+    """
+    Drop exact and near-duplicate texts, keeping the first occurrence.
+
+    Near duplicates are detected by the Jaccard similarity of their word
+    3-shingles, which is cheap to compute exactly for a handful of
+    retrieved documents.
+
+    Args:
+        texts (list): Document texts, in order of preference
+        threshold (float): Similarity above which a text counts as a duplicate
+
+    Returns:
+        list: The texts that are not duplicates of an earlier one
+    """
+    kept = []
+    kept_shingles = []
+    for text in dict.fromkeys(texts):
+        words = text.lower().split()
+        shingles = {tuple(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+        if any(len(shingles & other) / len(shingles | other) > threshold for other in kept_shingles):
+            continue
+        kept.append(text)
+        kept_shingles.append(shingles)
+    return kept
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    Get the tokenizer used to measure context, or None if it cannot be loaded.
+
+    tiktoken downloads its encoding files on first use, so offline
+    deployments fall back to a character estimate.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("Token budgeting falls back to a character estimate: %s", e)
+        return None
+
+
+def fit_token_budget(texts, budget):
+    """
+    Keep the leading texts that fit in a token budget.
+
+    Texts are kept in order until the budget runs out; the text that
+    crosses the budget is truncated to the tokens left.
+
+    Args:
+        texts (list): Document texts, in order of preference
+        budget (int): Maximum number of tokens to keep; 0 or less disables the limit
+
+    Returns:
+        list: The texts that fit in the budget
+    """
+    if budget <= 0:
+        return texts
+    encoding = _get_encoding()
+    kept = []
+    for text in texts:
+        if encoding is not None:
+            tokens = encoding.encode(text)
+            fits = len(tokens) <= budget
+            truncated = text if fits else encoding.decode(tokens[:budget])
+            budget -= min(len(tokens), budget)
+        else:
+            fits = len(text) <= budget * _CHARS_PER_TOKEN
+            truncated = text if fits else text[:budget * _CHARS_PER_TOKEN]
+            budget -= min(-(-len(text) // _CHARS_PER_TOKEN), budget)
+        if truncated:
+            kept.append(truncated)
+        if not fits or budget == 0:
+            break
+    return kept
+
+
+class LocalVectorIndex:
+    """
+    In-process exact cosine-similarity index mirroring a small Pinecone index.
+
+    The mirror is loaded from Pinecone once and then kept in step by adding
+    every vector that is upserted, so queries are answered from memory.
+    Exact search over a normalized matrix is a single matrix-vector product,
+    which is faster than an ANN structure at the size of a campaign history.
+
+    Attributes:
+        loaded: Whether the mirror has been loaded from Pinecone
+    """
+
+    def __init__(self):
+        """Initialize an empty, unloaded mirror."""
+        self._vectors = None
+        self._texts = []
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # (id, vector, text) entries added while a load is in progress, else None
+        self._pending = None
+        self.loaded = False
+
+    @staticmethod
+    def _normalize(vectors):
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    def load(self, index, namespace=None):
+        """
+        Load every vector and its text from a Pinecone index namespace.
+
+        Does nothing if the mirror is already loaded. Vectors added while
+        the index is being read are merged in afterwards, unless the read
+        already returned them.
+
+        Args:
+            index: Pinecone index handle to read from
+            namespace (str): Optional Pinecone namespace to read
+        """
+        with self._load_lock:
+            if self.loaded:
+                return
+            with self._lock:
+                self._pending = []
+            try:
+                ids, vectors, texts = set(), [], []
+                for page in index.list(namespace=namespace):
+                    for vector_id, vector in index.fetch(ids=page, namespace=namespace).vectors.items():
+                        ids.add(vector_id)
+                        vectors.append(vector.values)
+                        texts.append(vector.metadata["text"])
+                with self._lock:
+                    for vector_id, vector, text in self._pending:
+                        if vector_id not in ids:
+                            vectors.append(vector)
+                            texts.append(text)
+                    self._vectors = self._normalize(vectors) if vectors else None
+                    self._texts = texts
+                    self.loaded = True
+            finally:
+                with self._lock:
+                    self._pending = None
+
+    def add(self, ids, vectors, texts):
+        """
+        Add vectors that were upserted to the mirrored index.
+
+        Ignored before the mirror starts loading, since loading reads them
+        back; held until the load completes if one is in progress.
+
+        Args:
+            ids (list): Vector ids
+            vectors (list): Embedding vectors
+            texts (list): Document text for each vector
+        """
+        if not vectors:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(zip(ids, vectors, texts))
+                return
+            if not self.loaded:
+                return
+            added = self._normalize(vectors)
+            self._vectors = added if self._vectors is None else np.vstack((self._vectors, added))
+            self._texts = self._texts + list(texts)
+
+    def mmr_query(self, vector, top_k=5, fetch_k=20, lambda_mult=0.5):
+        """
+        Retrieve relevant but mutually diverse texts by maximal marginal relevance.
+
+        The fetch_k most similar vectors are taken as candidates, then matches
+        are picked one at a time, trading similarity to the query against
+        similarity to the matches already picked.
+
+        Args:
+            vector (list): Query embedding vector
+            top_k (int): Number of matches to return
+            fetch_k (int): Number of nearest candidates to choose from
+            lambda_mult (float): 1.0 ranks by relevance only, 0.0 by diversity only
+
+        Returns:
+            list: Document texts, in the order they were picked
+        """
+        with self._lock:
+            vectors, texts = self._vectors, self._texts
+        if vectors is None:
+            return []
+        scores = vectors @ self._normalize([vector])[0]
+        candidates = np.argsort(-scores)[:fetch_k]
+        picked = [candidates[0]]
+        while len(picked) < min(top_k, len(candidates)):
+            redundancy = (vectors[candidates] @ vectors[picked].T).max(axis=1)
+            marginal = lambda_mult * scores[candidates] - (1 - lambda_mult) * redundancy
+            marginal[np.isin(candidates, picked)] = -np.inf
+            picked.append(candidates[int(np.argmax(marginal))])
+        return [texts[i] for i in picked]
+
+    def clear(self):
+        """Drop every vector, e.g. after the mirrored namespace was deleted."""
+        with self._lock:
+            self._vectors = None
+            self._texts = []
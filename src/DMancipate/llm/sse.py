@@ -0,0 +1,39 @@
+"""
+Server-Sent Events helpers for HCM AI Sample App.
+
+This module formats the chat streaming events shared by every client type,
+so each event costs one JSON string encode and two byte concatenations.
+"""
+
+import orjson
+
+# Constant byte halves of the events; only the text itself is JSON-encoded
+_CONTENT_EVENT_PREFIX = b'data: {"content":'
+_ERROR_EVENT_PREFIX = b'data: {"content":"","error":'
+_EVENT_SUFFIX = b"}\n\n"
+
+
+def content_event(text):
+    """
+    Format a chunk of response text as a Server-Sent Event.
+
+    Args:
+        text (str): Response text to send
+
+    Returns:
+        bytes: data: {"content": "text"} followed by a blank line
+    """
+    return _CONTENT_EVENT_PREFIX + orjson.dumps(text) + _EVENT_SUFFIX
+
+
+def error_event(error):
+    """
+    Format a streaming failure as a Server-Sent Event.
+
+    Args:
+        error (Exception): The error that interrupted the stream
+
+    Returns:
+        bytes: data: {"content": "", "error": "streaming error: ..."} followed by a blank line
+    """
+    return _ERROR_EVENT_PREFIX + orjson.dumps(f"streaming error: {error}") + _EVENT_SUFFIX
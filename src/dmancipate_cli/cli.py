@@ -12,22 +12,222 @@ basic HTTP client dependencies.
 
 import argparse
 import json
+import os
+import random
 import sys
-import requests
+import time
+from pathlib import Path
 from typing import Optional
 
+# orjson is optional; its decode errors subclass json.JSONDecodeError, so callers catch either
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# urllib3 (and ssl) is imported only once a request is about to be made, so --help and
+# argument errors exit without loading it
+
+SEPARATOR = "-" * 50
+RESET_BANNER = (
+    "🗑️  Resetting campaign history...\n"
+    "⚠️  This will delete all game history. This action cannot be undone.\n"
+    f"{SEPARATOR}\n"
+)
+
+
+def _failure_kind(error) -> str:
+    """
+    Classify a urllib3 request error.
+
+    Args:
+        error: The urllib3 exception raised by the request
+
+    Returns:
+        "connect" if the server could not be reached, "timeout" if it stopped
+        responding mid-request, or "other"
+    """
+    from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
+
+    if isinstance(error, MaxRetryError):
+        error = error.reason
+    if isinstance(error, ReadTimeoutError):
+        return "timeout"
+    # ConnectTimeoutError is also the base of NewConnectionError (connection refused).
+    # ProtocolError means the connection dropped after the request was sent, so the
+    # server was reachable and may have processed it; it falls through to "other"
+    if isinstance(error, ConnectTimeoutError):
+        return "connect"
+    return "other"
+
+
+def _retry_policy():
+    """
+    Build the retry policy for the CLI session.
+
+    Connection failures are retried for every method since the request never
+    reached the server; throttling and gateway errors only for GET and DELETE,
+    so a chat turn is never generated and recorded twice. Read timeouts are
+    never retried. Each backoff sleeps a random fraction of the exponential
+    delay (full jitter).
+
+    Returns:
+        Retry: urllib3 retry policy for the session adapter
+    """
+    from urllib3.util.retry import Retry
+
+    class JitteredRetry(Retry):
+        def get_backoff_time(self) -> float:
+            return random.uniform(0, super().get_backoff_time())
+
+    return JitteredRetry(
+        total=3,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET", "DELETE"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class _CircuitBreaker:
+    """
+    Circuit breaker persisted across CLI invocations.
+
+    After FAILURE_THRESHOLD consecutive connection failures the circuit opens
+    and requests are refused without touching the network for
+    RECOVERY_SECONDS. The next request after that is let through as a trial
+    (half-open): a response closes the circuit, another failure reopens it.
+    State is kept per server URL in a small JSON file in the user cache
+    directory.
+    """
+
+    FAILURE_THRESHOLD = 3
+    RECOVERY_SECONDS = 30
+    PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "dmancipate" / "cb.json"
+
+    def __init__(self, base_url: str):
+        """Load the breaker state for a server URL."""
+        self._base_url = base_url
+        try:
+            self._states = _loads(self.PATH.read_bytes())
+        except (OSError, ValueError):
+            self._states = {}
+        self._state = self._states.get(base_url, {"state": "closed", "failures": 0, "opened_at": 0.0})
+        self._dirty = False
+
+    def _set(self, **state):
+        self._state = {**self._state, **state}
+        self._dirty = True
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            False while the circuit is open, True otherwise
+        """
+        if self._state["state"] != "open":
+            return True
+        if time.time() - self._state["opened_at"] < self.RECOVERY_SECONDS:
+            return False
+        self._set(state="half_open")
+        return True
+
+    def record_success(self):
+        """Close the circuit after the server answered."""
+        if self._state["state"] != "closed" or self._state["failures"]:
+            self._set(state="closed", failures=0, opened_at=0.0)
+
+    def record_failure(self):
+        """Count a connection failure, opening the circuit at the threshold or after a failed trial."""
+        failures = self._state["failures"] + 1
+        if self._state["state"] == "half_open" or failures >= self.FAILURE_THRESHOLD:
+            self._set(state="open", failures=failures, opened_at=time.time())
+        else:
+            self._set(failures=failures)
+
+    def save(self):
+        """Write the state back if it changed; a read-only cache directory is ignored."""
+        if not self._dirty:
+            return
+        self._states[self._base_url] = self._state
+        try:
+            self.PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.PATH.write_bytes(_dumps(self._states))
+        except OSError:
+            pass
+
 
 class DMancipateCLI:
     """CLI client for DMancipate DM chatbot."""
     
-    ALLOWED_ACTIONS = ["talk", "attack", "skill_check", "use_item", "look", "pick_up", "ask", "reset", "review", "use_skill"]
+    ALLOWED_ACTIONS = ("talk", "attack", "skill_check", "use_item", "look", "pick_up", "ask", "reset", "review", "use_skill")
+    _ALLOWED_SET = frozenset(ALLOWED_ACTIONS)
+    _CHAT_ACTIONS_STR = ", ".join(a for a in ALLOWED_ACTIONS if a != "reset")
     DEFAULT_HOST = "localhost"
     DEFAULT_PORT = 5000
+    # (connect, read) timeouts in seconds: a down server fails fast, a thinking DM gets 10 minutes
+    CHAT_TIMEOUT = (2, 600)
+    RESET_TIMEOUT = (2, 30)
     
     def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
         """Initialize the CLI client with API server details."""
+        import urllib3
+
         self.base_url = f"http://{host}:{port}"
+        self.chat_url = f"{self.base_url}/chat"
+        self.health_url = f"{self.base_url}/health"
+        # One keep-alive pool so every request to the server reuses the same connection
+        self.http = urllib3.PoolManager(
+            num_pools=1, maxsize=2, retries=_retry_policy(), headers={"Content-Type": "application/json"}
+        )
+        # Fails fast without a connection attempt while the server is known to be down
+        self.breaker = _CircuitBreaker(self.base_url)
+
+    def close(self):
+        """Close the pooled HTTP connections and save the circuit breaker state."""
+        self.http.clear()
+        self.breaker.save()
     
+    def _request(self, method: str, url: str, timeout: tuple, body: Optional[bytes] = None):
+        """
+        Send a request through the connection pool.
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            timeout: (connect, read) timeouts in seconds
+            body: Optional encoded request body
+
+        Returns:
+            urllib3.BaseHTTPResponse: The fully read response
+        """
+        import urllib3
+
+        connect, read = timeout
+        return self.http.request(method, url, body=body, timeout=urllib3.Timeout(connect=connect, read=read))
+
+    @staticmethod
+    def _error_message(response) -> str:
+        """
+        Extract the error message from a failed API response.
+
+        Args:
+            response: The non-200 HTTP response
+
+        Returns:
+            The server's error message, or the HTTP status if the body has none
+        """
+        # Content-Type may carry parameters, e.g. "application/json; charset=utf-8"
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return _loads(response.data).get("error", f"HTTP {response.status}")
+        return f"HTTP {response.status}"
+
     def send_request(self, action: str, prompt: str) -> Optional[str]:
         """
         Send a request to the DMancipate API.
@@ -39,45 +239,42 @@ class DMancipateCLI:
         Returns:
             The response from the API, or None if there was an error
         """
-        if action not in self.ALLOWED_ACTIONS or action == "reset":
+        from urllib3.exceptions import HTTPError
+
+        if action == "reset" or action not in self._ALLOWED_SET:
             print(f"Error: Invalid action '{action}' for chat request.")
-            print(f"Allowed actions: {', '.join([a for a in self.ALLOWED_ACTIONS if a != 'reset'])}")
+            print(f"Allowed actions: {self._CHAT_ACTIONS_STR}")
             return None
         
         # Prepare the request payload
         payload = {
             "prompt": prompt,
             "action": action,
-            "enable_stream": "False"  # CLI doesn't use streaming
+            "enable_stream": False  # CLI doesn't use streaming
         }
         
         try:
             # Make the API request
-            response = requests.post(
-                f"{self.base_url}/chat",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=600  # 10 minute timeout
-            )
+            response = self._request("POST", self.chat_url, self.CHAT_TIMEOUT, body=_dumps(payload))
+            self.breaker.record_success()
             
-            if response.status_code == 200:
-                data = response.json()
+            if response.status == 200:
+                data = _loads(response.data)
                 return data.get("result", "No response received")
             else:
-                error_data = response.json() if response.headers.get("content-type") == "application/json" else {}
-                error_msg = error_data.get("error", f"HTTP {response.status_code}")
-                print(f"Error: {error_msg}")
+                print(f"Error: {self._error_message(response)}")
                 return None
                 
-        except requests.exceptions.ConnectionError:
-            print(f"Error: Could not connect to DMancipate API at {self.base_url}")
-            print("Make sure the DMancipate server is running.")
-            return None
-        except requests.exceptions.Timeout:
-            print("Error: Request timed out. The DM might be thinking too hard!")
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"Error: Request failed - {e}")
+        except HTTPError as e:
+            kind = _failure_kind(e)
+            if kind == "connect":
+                self.breaker.record_failure()
+                print(f"Error: Could not connect to DMancipate API at {self.base_url}")
+                print("Make sure the DMancipate server is running.")
+            elif kind == "timeout":
+                print("Error: Request timed out. The DM might be thinking too hard!")
+            else:
+                print(f"Error: Request failed - {e}")
             return None
         except json.JSONDecodeError:
             print("Error: Invalid response from server")
@@ -90,33 +287,31 @@ class DMancipateCLI:
         Returns:
             True if reset was successful, False otherwise
         """
+        from urllib3.exceptions import HTTPError
+
         try:
             # Make the DELETE request to reset campaign history
-            response = requests.delete(
-                f"{self.base_url}/chat",
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            response = self._request("DELETE", self.chat_url, self.RESET_TIMEOUT)
+            self.breaker.record_success()
             
-            if response.status_code == 200:
-                data = response.json()
+            if response.status == 200:
+                data = _loads(response.data)
                 print(f"✅ {data.get('message', 'Campaign history reset successfully')}")
                 return True
             else:
-                error_data = response.json() if response.headers.get("content-type") == "application/json" else {}
-                error_msg = error_data.get("error", f"HTTP {response.status_code}")
-                print(f"Error: {error_msg}")
+                print(f"Error: {self._error_message(response)}")
                 return False
                 
-        except requests.exceptions.ConnectionError:
-            print(f"Error: Could not connect to DMancipate API at {self.base_url}")
-            print("Make sure the DMancipate server is running.")
-            return False
-        except requests.exceptions.Timeout:
-            print("Error: Request timed out during reset operation")
-            return False
-        except requests.exceptions.RequestException as e:
-            print(f"Error: Reset request failed - {e}")
+        except HTTPError as e:
+            kind = _failure_kind(e)
+            if kind == "connect":
+                self.breaker.record_failure()
+                print(f"Error: Could not connect to DMancipate API at {self.base_url}")
+                print("Make sure the DMancipate server is running.")
+            elif kind == "timeout":
+                print("Error: Request timed out during reset operation")
+            else:
+                print(f"Error: Reset request failed - {e}")
             return False
         except json.JSONDecodeError:
             print("Error: Invalid response from server during reset")
@@ -129,17 +324,51 @@ class DMancipateCLI:
         Returns:
             True if the server is healthy, False otherwise
         """
+        from urllib3.exceptions import HTTPError
+
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            return response.status_code == 200
-        except requests.exceptions.RequestException:
+            response = self._request("GET", self.health_url, (5, 5))
+            self.breaker.record_success()
+            return response.status == 200
+        except HTTPError as e:
+            if _failure_kind(e) == "connect":
+                self.breaker.record_failure()
             return False
 
 
-def main():
-    """Main CLI entry point."""
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the CLI.
+
+    Returns:
+        The parser with one subcommand per action
+    """
+    # Connection options are accepted before or after the action; with SUPPRESS an option that
+    # is not given leaves the value already in the namespace, so defaults come from there
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--host",
+        default=argparse.SUPPRESS,
+        help=f"API server host (default: {DMancipateCLI.DEFAULT_HOST})"
+    )
+    
+    common.add_argument(
+        "--port",
+        type=int,
+        default=argparse.SUPPRESS,
+        help=f"API server port (default: {DMancipateCLI.DEFAULT_PORT})"
+    )
+    
+    common.add_argument(
+        "--check-health",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Check if the API server is running and exit"
+    )
+    
     parser = argparse.ArgumentParser(
         description="DMancipate CLI - Interact with your DM chatbot",
+        parents=[common],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -154,86 +383,82 @@ Available actions: talk, attack, skill_check, use_item, look, pick_up, ask, rese
         """
     )
     
-    parser.add_argument(
-        "action",
-        choices=DMancipateCLI.ALLOWED_ACTIONS,
-        help="The action to perform"
-    )
-    
-    parser.add_argument(
-        "prompt",
-        nargs="?" if "reset" in sys.argv else None,
-        help="The message/prompt to send to the DM (not required for reset action)"
-    )
-    
-    parser.add_argument(
-        "--host",
-        default=DMancipateCLI.DEFAULT_HOST,
-        help=f"API server host (default: {DMancipateCLI.DEFAULT_HOST})"
-    )
-    
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=DMancipateCLI.DEFAULT_PORT,
-        help=f"API server port (default: {DMancipateCLI.DEFAULT_PORT})"
-    )
-    
-    parser.add_argument(
-        "--check-health",
-        action="store_true",
-        help="Check if the API server is running and exit"
-    )
+    subparsers = parser.add_subparsers(dest="action", metavar="action", help="The action to perform")
+    for action in DMancipateCLI.ALLOWED_ACTIONS:
+        if action == "reset":
+            subparsers.add_parser(action, parents=[common], help="Delete all campaign history")
+        else:
+            subparser = subparsers.add_parser(action, parents=[common], help=f"Send a '{action}' action to the DM")
+            subparser.add_argument("prompt", help="The message/prompt to send to the DM")
     
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import so repeated main() calls (tests, embedded use) reuse it
+_PARSER = _build_parser()
+
+
+def main():
+    """Main CLI entry point."""
+    args = _PARSER.parse_args(namespace=argparse.Namespace(
+        host=DMancipateCLI.DEFAULT_HOST, port=DMancipateCLI.DEFAULT_PORT, check_health=False
+    ))
+    if args.action is None and not args.check_health:
+        _PARSER.error("an action is required")
     
     # Initialize CLI client
     cli = DMancipateCLI(host=args.host, port=args.port)
     
-    # Health check mode
-    if args.check_health:
-        if cli.check_health():
-            print("✅ DMancipate API is running and healthy!")
-            sys.exit(0)
-        else:
-            print("❌ DMancipate API is not responding")
-            sys.exit(1)
-    
-    # Check if API is available before making the request
-    if not cli.check_health():
-        print("❌ DMancipate API is not responding. Make sure the server is running.")
-        sys.exit(1)
+    try:
+        # Health check mode
+        if args.check_health:
+            if cli.check_health():
+                print("✅ DMancipate API is running and healthy!")
+                sys.exit(0)
+            else:
+                print("❌ DMancipate API is not responding")
+                sys.exit(1)
+
+        # Fail fast while the server is known to be down instead of waiting on a connect timeout
+        if not cli.breaker.allow():
+            print(f"❌ DMancipate API at {cli.base_url} is not responding; not retrying for up to "
+                  f"{_CircuitBreaker.RECOVERY_SECONDS} seconds. Use --check-health to test it now.")
+            sys.exit(2)
     
-    # Handle reset command separately
-    if args.action == "reset":
-        print("🗑️  Resetting campaign history...")
-        print("⚠️  This will delete all game history. This action cannot be undone.")
-        print("-" * 50)
+        # Handle reset command separately
+        if args.action == "reset":
+            sys.stdout.write(RESET_BANNER)
+            sys.stdout.flush()
         
-        if cli.reset_campaign():
-            print("🎯 Campaign has been reset to a fresh state!")
+            if cli.reset_campaign():
+                print("🎯 Campaign has been reset to a fresh state!")
+            else:
+                sys.exit(1)
         else:
-            sys.exit(1)
-    else:
-        # Validate that prompt is provided for non-reset actions
-        if not args.prompt:
-            print("Error: Prompt is required for this action.")
-            print("Use 'dmancipate --help' for usage information.")
-            sys.exit(1)
+            # Validate that prompt is provided for non-reset actions
+            if not args.prompt:
+                print("Error: Prompt is required for this action.")
+                print("Use 'dmancipate --help' for usage information.")
+                sys.exit(1)
             
-        # Send the regular chat request
-        print(f"🎲 Sending '{args.action}' action to DM...")
-        print(f"📝 Prompt: {args.prompt}")
-        print("⏳ Waiting for DM response...")
-        print("-" * 50)
+            # Send the regular chat request
+            sys.stdout.write(
+                f"🎲 Sending '{args.action}' action to DM...\n"
+                f"📝 Prompt: {args.prompt}\n"
+                f"⏳ Waiting for DM response...\n"
+                f"{SEPARATOR}\n"
+            )
+            # Flush the banner so it shows while waiting, even when stdout is piped
+            sys.stdout.flush()
         
-        response = cli.send_request(args.action, args.prompt)
+            response = cli.send_request(args.action, args.prompt)
         
-        if response:
-            print("🎯 DM Response:")
-            print(response)
-        else:
-            sys.exit(1)
+            if response:
+                sys.stdout.write(f"🎯 DM Response:\n{response}\n")
+            else:
+                sys.exit(1)
+    finally:
+        cli.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+import os
+
+# Importing DMancipate builds the app and the LLM client, so configure a local provider
+os.environ.setdefault("LLM_CLIENT_TYPE", "langchain")
+os.environ.setdefault("LANGCHAIN_PROVIDER", "ollama")
+os.environ.setdefault("PINECONE_API_KEY", "test")
@@ -0,0 +1,73 @@
+import threading
+import types
+
+import pytest
+
+from DMancipate.llm import langchain_client
+from DMancipate.llm.langchain_client import LangChainClient
+from DMancipate.llm.response_cache import ResponseCache
+from DMancipate.llm.retrieval import LocalVectorIndex
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        return [1.0, float(len(text)), 0.0]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+class FakeIndex:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, vectors, namespace=None):
+        self.upserts.append(vectors)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    index = FakeIndex()
+    monkeypatch.setattr(langchain_client, "get_index", lambda name: index)
+    # Bypass __init__, which builds the LLM and starts the history writer thread
+    client = LangChainClient.__new__(LangChainClient)
+    client._embeddings = FakeEmbeddings()
+    client._local_history = LocalVectorIndex()
+    client._campaign_empty = None
+    client._response_cache = ResponseCache(client._embeddings)
+    client._history_lock = threading.Lock()
+    client._history_generation = 0
+    client.index = index
+    return client
+
+
+def test_repeated_prompt_hits_cache_after_write_back(client):
+    cache = client._response_cache
+    cache.put("look", "look around", "A dark cave.", cache.generation)
+
+    client._update_campaign_vector_store(["The party enters the cave."])
+
+    assert client.index.upserts
+    assert cache.get_exact("look", "Look  around") == "A dark cave."
+
+
+def test_reset_empties_cache(client):
+    cache = client._response_cache
+    generation = cache.generation
+    cache.put("look", "look around", "A dark cave.", generation)
+
+    client.reset_campaign_caches()
+
+    assert cache.get_exact("look", "look around") is None
+    # A response whose context was retrieved before the reset is not stored
+    cache.put("look", "look around", "A dark cave.", generation)
+    assert cache.get_exact("look", "look around") is None
+
+
+@pytest.mark.parametrize("key", ["__default__", ""])
+def test_default_namespace_with_history_is_not_empty(client, monkeypatch, key):
+    stats = types.SimpleNamespace(namespaces={key: types.SimpleNamespace(vector_count=3)})
+    client.index.describe_index_stats = lambda: stats
+    monkeypatch.setattr(langchain_client.conf, "CAMPAIGN_SESSION_ID", None)
+
+    assert client._is_campaign_empty() is False
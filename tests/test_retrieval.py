@@ -0,0 +1,49 @@
+import types
+
+from DMancipate.llm.retrieval import LocalVectorIndex
+
+
+class FakeIndex:
+    """Index whose listing runs a callback, standing in for an upsert that lands mid-load."""
+
+    def __init__(self, vectors, during_list=None):
+        self.vectors = vectors
+        self.during_list = during_list
+
+    def list(self, namespace=None):
+        if self.during_list:
+            self.during_list()
+        yield list(self.vectors)
+
+    def fetch(self, ids, namespace=None):
+        return types.SimpleNamespace(vectors={
+            vector_id: types.SimpleNamespace(values=values, metadata={"text": text})
+            for vector_id, (values, text) in self.vectors.items() if vector_id in ids
+        })
+
+
+def test_add_during_load_is_kept():
+    mirror = LocalVectorIndex()
+    index = FakeIndex({"a": ([1.0, 0.0], "old turn")})
+    index.during_list = lambda: mirror.add(["b"], [[0.0, 1.0]], ["new turn"])
+
+    mirror.load(index)
+
+    assert sorted(mirror.mmr_query([1.0, 1.0], top_k=5)) == ["new turn", "old turn"]
+
+
+def test_add_during_load_already_read_is_not_duplicated():
+    mirror = LocalVectorIndex()
+    index = FakeIndex({"a": ([1.0, 0.0], "old turn")})
+    index.during_list = lambda: mirror.add(["a"], [[1.0, 0.0]], ["old turn"])
+
+    mirror.load(index)
+
+    assert mirror.mmr_query([1.0, 0.0], top_k=5) == ["old turn"]
+
+
+def test_add_before_load_is_ignored():
+    mirror = LocalVectorIndex()
+    mirror.add(["a"], [[1.0, 0.0]], ["old turn"])
+
+    assert mirror.mmr_query([1.0, 0.0]) == []